@@ -8,74 +8,165 @@ It can update an existing .env file with the new keys.
 
 import os
 import sys
-import argparse
 import secrets
-import string
-import jwt
-import datetime
-import re
-from pathlib import Path
+import functools
+import hmac
+import hashlib
+import base64
+import binascii
+import time
+from types import SimpleNamespace
+
+def _check_openssl_sha256():
+    """Warn if hashlib's SHA-256 is not the OpenSSL (SHA-NI/CPACF) implementation."""
+    try:
+        import _hashlib
+    except ImportError:
+        _hashlib = None
+    # Without OpenSSL, hmac/hashlib use CPython's builtin C SHA-256 (_sha256).
+    # That is already compiled code, and the HMAC input here is two blocks,
+    # so a JIT-compiled replacement would not pay for its compile time.
+    if _hashlib is None or hashlib.sha256 is not getattr(_hashlib, "openssl_sha256", None):
+        print("Warning: Python is not linked against OpenSSL; "
+              "JWT signing will fall back to the builtin SHA-256.", file=sys.stderr)
+
+_check_openssl_sha256()
 
 def generate_jwt_secret(length=40):
     """Generate a secure random string for JWT secret."""
-    alphabet = string.ascii_letters + string.digits
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
-
-def generate_jwt_token(secret, role, expiry_years=10):
-    """Generate a JWT token with the given role and expiry."""
-    now = datetime.datetime.now()
-    iat = int(now.timestamp())
-    exp = int((now + datetime.timedelta(days=365 * expiry_years)).timestamp())
-    
-    payload = {
-        "role": role,
-        "iss": "supabase",
-        "iat": iat,
-        "exp": exp
-    }
+    # token_urlsafe yields ~1.33 chars per byte from a single os.urandom call
+    return secrets.token_urlsafe(length)[:length]
+
+def _b64url(data):
+    """Base64url-encode bytes without padding (RFC 7515), returning bytes."""
+    # The unpadded length is known up front, so slice instead of rstrip
+    return base64.urlsafe_b64encode(data)[:(len(data) * 4 + 2) // 3]
+
+# Maps the standard base64 alphabet onto the URL-safe one
+_B64URL = bytes.maketrans(b'+/', b'-_')
+
+# The HS256 header never changes, so encode it once
+HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+@functools.lru_cache(maxsize=16)
+def _hmac_sha256(key):
+    """Return a keyed HMAC-SHA256 context to be .copy()'d per message.
+
+    Keying (the ipad/opad setup) is the expensive part of HMAC; copying a
+    prepared context lets every token signed with the same secret skip it.
+    """
+    return hmac.new(key, None, "sha256")
+
+def _sign_jwt(payload_b64, secret_bytes):
+    """Sign an already base64url-encoded payload segment as an HS256 JWT."""
+    # Stay in bytes throughout and decode once at the end
+    signature_input = HEADER_B64 + b"." + payload_b64
+    mac = _hmac_sha256(secret_bytes).copy()
+    mac.update(signature_input)
+    signature = mac.digest()
+    # A SHA-256 digest is always 32 bytes, i.e. 43 unpadded characters
+    signature_b64 = binascii.b2a_base64(signature, newline=False)[:43].translate(_B64URL)
+    return (signature_input + b"." + signature_b64).decode('ascii')
+
+@functools.lru_cache(maxsize=16)
+def _payload_prefix_b64(role):
+    """Pre-encode the constant start of a role's payload.
+
+    Base64 maps every 3 input bytes to 4 output characters, so the prefix
+    up to the last 3-byte boundary can be encoded once and the remainder
+    prepended to the per-call timestamps.
+    """
+    prefix = f'{{"role":"{role}","iss":"supabase","iat":'.encode('ascii')
+    aligned = len(prefix) - len(prefix) % 3
+    return _b64url(prefix[:aligned]), prefix[aligned:]
+
+@functools.lru_cache(maxsize=256)
+def generate_jwt_token(secret_bytes, role, iat, exp):
+    """Generate a JWT token with the given role and issued/expiry timestamps.
+
+    The secret is passed already encoded so that callers signing several
+    tokens encode it once and share one keyed HMAC context.
+
+    Tokens are deterministic in their arguments, so repeated calls (batch
+    key generation, tests) are served from the cache.
+    """
+    # The payload schema is fixed (ASCII role, integer timestamps), so only
+    # the timestamp tail is serialized and encoded per call
+    prefix_b64, prefix_rest = _payload_prefix_b64(role)
+    tail = prefix_rest + f'{iat},"exp":{exp}}}'.encode('ascii')
     
-    return jwt.encode(payload, secret, algorithm="HS256")
+    return _sign_jwt(prefix_b64 + _b64url(tail), secret_bytes)
 
 def update_env_file(env_file, jwt_secret, anon_key, service_key):
     """Update the .env file with the new keys."""
+    # Only needed on this path, so keep them off the default startup path
+    import shutil
+    import tempfile
+    
     if not os.path.exists(env_file):
         print(f"Error: .env file not found at {env_file}")
         return False
     
+    # Work on the real file: the backup link and the replace below would
+    # otherwise act on a symlink and leave its target untouched
+    env_file = os.path.realpath(env_file)
+    
     # Create a backup of the original .env file
-    backup_file = f"{env_file}.bak.{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+    backup_file = f"{env_file}.bak.{time.strftime('%Y%m%d%H%M%S')}"
     try:
-        with open(env_file, 'r') as f:
-            original_content = f.read()
-        
-        with open(backup_file, 'w') as f:
-            f.write(original_content)
+        # A hard link keeps the original inode as the backup without copying;
+        # the update below normally swaps a new file in rather than writing in place
+        try:
+            os.link(env_file, backup_file)
+        except OSError:
+            shutil.copy2(env_file, backup_file)
         
-        # Update the keys in the content
-        updated_content = re.sub(
-            r'^JWT_SECRET=.*$',
-            f'JWT_SECRET={jwt_secret}',
-            original_content,
-            flags=re.MULTILINE
-        )
+        replacements = {
+            b'JWT_SECRET': jwt_secret.encode(),
+            b'ANON_KEY': anon_key.encode(),
+            b'SERVICE_ROLE_KEY': service_key.encode(),
+        }
         
-        updated_content = re.sub(
-            r'^ANON_KEY=.*$',
-            f'ANON_KEY={anon_key}',
-            updated_content,
-            flags=re.MULTILINE
-        )
-        
-        updated_content = re.sub(
-            r'^SERVICE_ROLE_KEY=.*$',
-            f'SERVICE_ROLE_KEY={service_key}',
-            updated_content,
-            flags=re.MULTILINE
-        )
-        
-        # Write the updated content back to the .env file
-        with open(env_file, 'w') as f:
-            f.write(updated_content)
+        # Stream the keys into a temporary file, then atomically replace the .env file.
+        # mkstemp creates a fresh 0600 file with O_EXCL, so the new secrets are never
+        # readable by others and a planted .tmp symlink is not followed
+        st = os.stat(env_file)
+        env_dir, env_name = os.path.split(os.path.abspath(env_file))
+        fd, tmp_file = tempfile.mkstemp(prefix=f".{env_name}.", suffix=".tmp", dir=env_dir)
+        try:
+            with os.fdopen(fd, 'wb') as fout:
+                try:
+                    # Keep the mode and owner; os.replace would otherwise hand the file to us
+                    os.fchmod(fout.fileno(), st.st_mode & 0o777)
+                    os.fchown(fout.fileno(), st.st_uid, st.st_gid)
+                    can_swap = True
+                except (AttributeError, PermissionError):
+                    # No fchmod/fchown on this platform (Windows), or not allowed to chown
+                    can_swap = False
+                with open(env_file, 'rb') as fin:
+                    for line in fin:
+                        key, sep, rest = line.partition(b'=')
+                        if sep and key in replacements:
+                            # Keep the original line ending
+                            eol = rest[len(rest.rstrip(b'\r\n')):]
+                            line = key + b'=' + replacements[key] + eol
+                        fout.write(line)
+            if can_swap:
+                os.replace(tmp_file, env_file)
+            else:
+                # Rewrite in place so the mode and owner are kept, first
+                # turning a hard-linked backup into a real copy
+                if os.path.samefile(env_file, backup_file):
+                    os.unlink(backup_file)
+                    shutil.copy2(env_file, backup_file)
+                shutil.copyfile(tmp_file, env_file)
+                os.unlink(tmp_file)
+        except BaseException:
+            try:
+                os.unlink(tmp_file)
+            except FileNotFoundError:
+                pass
+            raise
         
         print(f"Created backup of .env file: {backup_file}")
         print(f"Updated .env file with new keys: {env_file}")
@@ -85,31 +176,83 @@ def update_env_file(env_file, jwt_secret, anon_key, service_key):
         print(f"Error updating .env file: {e}")
         return False
 
+_USAGE = """usage: generate_keys.py [-h] [--env-file ENV_FILE] [--jwt-length JWT_LENGTH] [--expiry-years EXPIRY_YEARS]
+
+Generate secure API keys for Supabase
+
+options:
+  -h, --help            show this help message and exit
+  --env-file ENV_FILE   Path to .env file to update
+  --jwt-length JWT_LENGTH
+                        Length of JWT secret
+  --expiry-years EXPIRY_YEARS
+                        Expiry in years for JWT tokens
+"""
+
+def _usage_error(message):
+    """Report a command-line error the way argparse does and exit."""
+    sys.stderr.write(f"{_USAGE.splitlines()[0]}\nerror: {message}\n")
+    sys.exit(2)
+
+def _parse_args(argv):
+    """Parse the three supported flags without pulling in argparse."""
+    options = {"--env-file": None, "--jwt-length": 40, "--expiry-years": 10}
+    converters = {"--jwt-length": int, "--expiry-years": int}
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        flag, sep, value = arg.partition("=")
+        if flag.startswith("--") and len(flag) > 2 and flag not in options and flag != "--help":
+            # Accept unambiguous prefixes, as argparse's allow_abbrev did
+            matches = [name for name in (*options, "--help") if name.startswith(flag)]
+            if len(matches) > 1:
+                _usage_error(f"ambiguous option: {flag} could match {', '.join(matches)}")
+            if matches:
+                flag = matches[0]
+        if not sep and flag in ("-h", "--help"):
+            sys.stdout.write(_USAGE)
+            sys.exit(0)
+        if flag not in options:
+            _usage_error(f"unrecognized argument: {arg}")
+        if not sep:
+            i += 1
+            if i == len(argv):
+                _usage_error(f"{flag} expects a value")
+            value = argv[i]
+        try:
+            options[flag] = converters.get(flag, str)(value)
+        except ValueError:
+            _usage_error(f"{flag}: invalid int value: '{value}'")
+        i += 1
+    return SimpleNamespace(
+        env_file=options["--env-file"],
+        jwt_length=options["--jwt-length"],
+        expiry_years=options["--expiry-years"],
+    )
+
 def main():
     """Main entry point for the script."""
-    parser = argparse.ArgumentParser(description="Generate secure API keys for Supabase")
-    parser.add_argument("--env-file", help="Path to .env file to update")
-    parser.add_argument("--jwt-length", type=int, default=40, help="Length of JWT secret")
-    parser.add_argument("--expiry-years", type=int, default=10, help="Expiry in years for JWT tokens")
-    
-    args = parser.parse_args()
+    args = _parse_args(sys.argv[1:])
     
     # Generate JWT secret
     jwt_secret = generate_jwt_secret(args.jwt_length)
     
+    # Both keys share the same issue and expiry timestamps
+    iat = int(time.time())
+    exp = iat + 365 * args.expiry_years * 86400
+    
     # Generate API keys
-    anon_key = generate_jwt_token(jwt_secret, "anon", args.expiry_years)
-    service_key = generate_jwt_token(jwt_secret, "service_role", args.expiry_years)
+    secret_bytes = jwt_secret.encode('ascii')
+    anon_key = generate_jwt_token(secret_bytes, "anon", iat, exp)
+    service_key = generate_jwt_token(secret_bytes, "service_role", iat, exp)
     
-    # Print the generated keys
-    print("\nGenerated Keys:")
-    print("=" * 50)
-    print(f"JWT Secret: {jwt_secret}")
-    print("-" * 50)
-    print(f"Anon Key: {anon_key}")
-    print("-" * 50)
-    print(f"Service Role Key: {service_key}")
-    print("=" * 50)
+    # Print the generated keys in a single write
+    sys.stdout.write(
+        f"\nGenerated Keys:\n{'=' * 50}\n"
+        f"JWT Secret: {jwt_secret}\n{'-' * 50}\n"
+        f"Anon Key: {anon_key}\n{'-' * 50}\n"
+        f"Service Role Key: {service_key}\n{'=' * 50}\n"
+    )
     
     # Update .env file if specified
     if args.env_file:
@@ -10,38 +10,71 @@ import os
 import sys
 import argparse
 import subprocess
+import shutil
+import stat
 from pathlib import Path
 import socket
 import psutil
 import time
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import re
 
-try:
-    from supabase_setup import SupabaseProjectGenerator
-except ImportError:
-    # If the module is not installed, use the local file
-    print("Warning: supabase_setup module not found. Using local file.")
+def _import_generator():
+    """Import SupabaseProjectGenerator on first use.
+
+    Only `create` needs the generator, so the other commands skip loading
+    supabase_setup and its templates entirely.
+    """
     try:
-        import importlib.util
-        spec = importlib.util.spec_from_file_location("supabase_setup", "./supabase_setup.py")
-        if spec and spec.loader:
-            supabase_setup = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(supabase_setup)
-            SupabaseProjectGenerator = supabase_setup.SupabaseProjectGenerator
-        else:
-            raise ImportError("Could not load supabase_setup.py")
-    except Exception as e:
-        print(f"Error loading supabase_setup.py: {e}")
-        print("Please ensure supabase_setup.py is in the current directory.")
-        sys.exit(1)
+        from supabase_setup import SupabaseProjectGenerator
+    except ImportError:
+        # If the module is not installed, import it from next to this script;
+        # a regular import reuses the cached bytecode in __pycache__
+        print("Warning: supabase_setup module not found. Using local file.")
+        sys.path.insert(0, str(Path(__file__).resolve().parent))
+        try:
+            from supabase_setup import SupabaseProjectGenerator
+        except Exception as e:
+            print(f"Error loading supabase_setup.py: {e}")
+            print("Please ensure supabase_setup.py is next to supabase_manager.py.")
+            sys.exit(1)
+    return SupabaseProjectGenerator
+
+# Ports shown after `start`, keyed by their .env variable
+_ENV_PORT_LABELS = {
+    "KONG_HTTP_PORT": "api",
+    "STUDIO_PORT": "studio",
+    "POSTGRES_PORT": "postgres",
+}
+_ENV_PORT_RE = re.compile(
+    r'^(KONG_HTTP_PORT|STUDIO_PORT|POSTGRES_PORT)=(.*?)\s*$', re.M
+)
+
+# Seconds a find_used_ports() scan stays valid
+_USED_PORTS_TTL = 1.0
+_used_ports_cache = (float("-inf"), frozenset())
 
 def find_used_ports():
-    """Find all currently used ports."""
+    """Find all currently used ports.
+
+    The scan walks /proc for every socket, so its result is reused for
+    _USED_PORTS_TTL seconds across repeated calls.
+    """
+    global _used_ports_cache
+    now = time.monotonic()
+    scanned_at, cached_ports = _used_ports_cache
+    if now - scanned_at < _USED_PORTS_TTL:
+        return set(cached_ports)
+    
     used_ports = set()
     
     try:
-        # Check listening ports using psutil
-        for conn in psutil.net_connections(kind='inet'):
+        # Only TCP sockets can be listening; 'tcp' covers IPv4 and IPv6
+        # and skips the UDP tables that 'inet' would also read
+        for conn in psutil.net_connections(kind='tcp'):
             if conn.status == 'LISTEN':
                 try:
                     # Try different approaches to get the port
@@ -60,13 +93,19 @@ def find_used_ports():
     except Exception as e:
         # If psutil fails, log the error but continue
         print(f"Warning: Error getting used ports: {e}")
+        return used_ports
     
+    _used_ports_cache = (now, frozenset(used_ports))
     return used_ports
 
 def check_project_exists(project_path):
     """Check if a project directory exists."""
-    project_dir = Path(project_path)
-    return project_dir.exists() and project_dir.is_dir()
+    # One stat serves both the existence and the directory test
+    try:
+        return stat.S_ISDIR(os.stat(project_path).st_mode)
+    except (OSError, ValueError):
+        # Same cases Path.exists() treats as "does not exist"
+        return False
 
 def create_project(args):
     """Create a new Supabase project."""
@@ -83,6 +122,7 @@ def create_project(args):
 
     # Create a project with the given name and base port
     try:
+        SupabaseProjectGenerator = _import_generator()
         generator = SupabaseProjectGenerator(project_path, args.base_port)
         generator.run()
         return 0
@@ -90,6 +130,24 @@ def create_project(args):
         print(f"Error creating project: {e}")
         return 1
 
+def _run_compose(cmd, project_path, verbose=False):
+    """Run a docker compose command in a project, returning (returncode, stderr).
+
+    Verbose runs inherit the terminal. Quiet runs discard stdout but keep
+    stderr, so that a failure can be reported with docker's reason.
+    """
+    if verbose:
+        return subprocess.run(cmd, cwd=project_path).returncode, ""
+    result = subprocess.run(cmd, cwd=project_path, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, errors="replace")
+    return result.returncode, result.stderr
+
+def _report_compose_failure(action, returncode, stderr):
+    """Print why a docker compose command failed."""
+    print(f"Error {action} project: docker compose exited with status {returncode}")
+    if stderr.strip():
+        print(stderr.rstrip())
+
 def start_project(args):
     """Start an existing Supabase project."""
     # Define projects directory
@@ -100,48 +158,41 @@ def start_project(args):
         print(f"Error: Project directory '{project_path}' does not exist.")
         return 1
 
-    # Change to the project directory
-    os.chdir(project_path)
-
     # Run docker compose up
+    cmd = ["docker", "compose", "up", "-d"]
     try:
-        cmd = ["docker", "compose", "up", "-d"]
-        if args.verbose:
-            subprocess.run(cmd)
-        else:
-            subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        
-        print(f"Project '{args.project_name}' started successfully.")
-        
-        # Load port information from the .env file
-        env_path = Path(".env")
-        if env_path.exists():
-            ports = {}
-            with open(env_path, 'r') as f:
-                for line in f:
-                    if "PORT=" in line:
-                        try:
-                            key, value = line.strip().split('=', 1)
-                            if key == "KONG_HTTP_PORT":
-                                ports["api"] = value
-                            elif key == "STUDIO_PORT":
-                                ports["studio"] = value
-                            elif key == "POSTGRES_PORT":
-                                ports["postgres"] = value
-                        except ValueError:
-                            continue
-            
-            # Display access URLs
-            if "studio" in ports and "api" in ports:
-                print("\nYou can access:")
-                print(f"- Studio dashboard: http://localhost:{ports['studio']}")
-                print(f"- API endpoint: http://localhost:{ports['api']}")
-                if "postgres" in ports:
-                    print(f"- PostgreSQL on port: {ports['postgres']}")
-        return 0
-    except Exception as e:
+        returncode, stderr = _run_compose(cmd, project_path, args.verbose)
+    except OSError as e:
+        # docker is missing or cannot be run
         print(f"Error starting project: {e}")
         return 1
+    if returncode != 0:
+        _report_compose_failure("starting", returncode, stderr)
+        return 1
+    
+    print(f"Project '{args.project_name}' started successfully.")
+    
+    # Load port information from the .env file in one read and scan
+    try:
+        env_ports = dict(_ENV_PORT_RE.findall(Path(project_path, ".env").read_text()))
+    except (OSError, UnicodeDecodeError):
+        # The project is already up; only the URL summary is skipped
+        env_ports = None
+    if env_ports is not None:
+        ports = {
+            label: env_ports[key]
+            for key, label in _ENV_PORT_LABELS.items()
+            if key in env_ports
+        }
+        
+        # Display access URLs
+        if "studio" in ports and "api" in ports:
+            print("\nYou can access:")
+            print(f"- Studio dashboard: http://localhost:{ports['studio']}")
+            print(f"- API endpoint: http://localhost:{ports['api']}")
+            if "postgres" in ports:
+                print(f"- PostgreSQL on port: {ports['postgres']}")
+    return 0
 
 def stop_project(args):
     """Stop a running Supabase project."""
@@ -153,25 +204,23 @@ def stop_project(args):
         print(f"Error: Project directory '{project_path}' does not exist.")
         return 1
 
-    # Change to the project directory
-    os.chdir(project_path)
-
     # Run docker compose down
+    cmd = ["docker", "compose", "down"]
+    if not args.volumes:
+        cmd.append("-v")
+    
     try:
-        cmd = ["docker", "compose", "down"]
-        if not args.volumes:
-            cmd.append("-v")
-        
-        if args.verbose:
-            subprocess.run(cmd)
-        else:
-            subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        
-        print(f"Project '{args.project_name}' stopped successfully.")
-        return 0
-    except Exception as e:
+        returncode, stderr = _run_compose(cmd, project_path, args.verbose)
+    except OSError as e:
+        # docker is missing or cannot be run
         print(f"Error stopping project: {e}")
         return 1
+    if returncode != 0:
+        _report_compose_failure("stopping", returncode, stderr)
+        return 1
+    
+    print(f"Project '{args.project_name}' stopped successfully.")
+    return 0
 
 def reset_project(args):
     """Reset a Supabase project by removing database data."""
@@ -183,39 +232,66 @@ def reset_project(args):
         print(f"Error: Project directory '{project_path}' does not exist.")
         return 1
 
-    # Change to the project directory
-    os.chdir(project_path)
-
     # Run the reset script if it exists
-    reset_script = Path("reset.sh")
+    reset_script = Path(project_path, "reset.sh")
     if reset_script.exists():
-        try:
-            subprocess.run(["sh", "./reset.sh"], check=True)
-            print(f"Project '{args.project_name}' reset successfully.")
-            return 0
-        except subprocess.CalledProcessError as e:
-            print(f"Error executing reset script: {e}")
+        returncode = subprocess.run(["sh", "./reset.sh"], cwd=project_path).returncode
+        if returncode != 0:
+            print(f"Error executing reset script: exited with status {returncode}")
             return 1
+        print(f"Project '{args.project_name}' reset successfully.")
+        return 0
     
     # Manual reset if script doesn't exist
     try:
-        # Stop the containers first
-        subprocess.run(["docker", "compose", "down", "-v"], 
-                      stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        
-        # Remove database data
-        db_data_dir = Path("volumes/db/data")
-        if db_data_dir.exists():
-            subprocess.run(["rm", "-rf", str(db_data_dir)])
-        
-        # Recreate directory
+        # Stop the containers first. This is the only process spawned on
+        # this path; the data removal and mkdir below stay in-process
+        returncode, stderr = _run_compose(["docker", "compose", "down", "-v"], project_path)
+    except OSError as e:
+        # docker is missing or cannot be run
+        print(f"Error resetting project: {e}")
+        return 1
+    if returncode != 0:
+        # Leave the data alone if the containers may still be using it
+        _report_compose_failure("resetting", returncode, stderr)
+        return 1
+    
+    # Remove database data in-process rather than spawning rm -rf;
+    # like rm -rf, a missing directory or stray failure is not fatal
+    db_data_dir = Path(project_path, "volumes/db/data")
+    shutil.rmtree(db_data_dir, ignore_errors=True)
+    
+    # Recreate directory
+    try:
         db_data_dir.mkdir(parents=True, exist_ok=True)
-        
-        print(f"Project '{args.project_name}' reset successfully.")
-        return 0
-    except Exception as e:
+    except OSError as e:
         print(f"Error resetting project: {e}")
         return 1
+    
+    print(f"Project '{args.project_name}' reset successfully.")
+    return 0
+
+def _parse_compose_ps(lines):
+    """Parse `docker compose ps --format json` output into a list of dicts.
+
+    Takes any iterable of lines, so output can be decoded as it arrives.
+    Newer Compose prints a single JSON array, older releases one object
+    per line; both are handled.
+    """
+    containers = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            print(f"Warning: Could not parse container info: {line.rstrip()}")
+            continue
+        if isinstance(data, list):
+            containers.extend(data)
+        else:
+            containers.append(data)
+    return containers
 
 def status_project(args):
     """Check the status of a Supabase project."""
@@ -227,68 +303,88 @@ def status_project(args):
         print(f"Error: Project directory '{project_path}' does not exist.")
         return 1
 
-    # Change to the project directory
-    os.chdir(project_path)
-
     # Run docker compose ps
     try:
-        result = subprocess.run(
+        with subprocess.Popen(
             ["docker", "compose", "ps", "--format", "json"],
-            capture_output=True,
+            cwd=project_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True
-        )
-        
-        if result.returncode != 0:
-            print(f"Error checking project status: {result.stderr}")
-            return 1
-        
-        # Parse the JSON output
-        containers = []
-        for line in result.stdout.strip().split('\n'):
-            if not line.strip():
-                continue
-            try:
-                container = json.loads(line)
-                containers.append(container)
-            except json.JSONDecodeError:
-                print(f"Warning: Could not parse container info: {line}")
-        
-        # Display service status
-        print(f"Status of project '{args.project_name}':")
-        print("-" * 80)
-        print(f"{'Service':<30} {'Status':<15} {'Health':<15} {'Ports':<20}")
-        print("-" * 80)
-        
-        for container in containers:
-            name = container.get('Name', 'unknown').replace(f"{args.project_name}-", "")
-            status = container.get('State', 'unknown')
-            health = container.get('Health', 'N/A')
-            ports = container.get('Ports', '')
-            
-            print(f"{name:<30} {status:<15} {health:<15} {ports:<20}")
-        
-        return 0
-    except Exception as e:
+        ) as proc:
+            # Drain stderr alongside stdout: if its pipe filled up, docker
+            # would block there and never finish writing stdout
+            stderr_chunks = []
+            drain = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()))
+            drain.start()
+            # Parse the JSON output line by line while docker is writing it
+            containers = _parse_compose_ps(proc.stdout)
+            drain.join()
+        stderr = "".join(stderr_chunks)
+    except FileNotFoundError as e:
+        # docker itself is missing
         print(f"Error checking project status: {e}")
         return 1
+    
+    if proc.returncode != 0:
+        print(f"Error checking project status: {stderr}")
+        return 1
+    
+    # Display service status
+    print(f"Status of project '{args.project_name}':")
+    print("-" * 80)
+    print(f"{'Service':<30} {'Status':<15} {'Health':<15} {'Ports':<20}")
+    print("-" * 80)
+    
+    for container in containers:
+        name = container.get('Name', 'unknown').replace(f"{args.project_name}-", "")
+        status = container.get('State', 'unknown')
+        health = container.get('Health', 'N/A')
+        ports = container.get('Ports', '')
+        
+        print(f"{name:<30} {status:<15} {health:<15} {ports:<20}")
+    
+    return 0
+
+def _project_run_status(project):
+    """Return "Running", "Stopped" or "Unknown" for a project directory."""
+    try:
+        result = subprocess.run(
+            ["docker", "compose", "ps", "--services", "--filter", "status=running"],
+            cwd=project,
+            capture_output=True,
+            text=True
+        )
+        is_running = result.returncode == 0 and result.stdout.strip() != ""
+        return "Running" if is_running else "Stopped"
+    except OSError:
+        # docker is missing, or the project directory cannot be entered
+        return "Unknown"
 
 def list_projects(args):
     """List all Supabase projects in the projects directory."""
     projects = []
     projects_dir = "projects"
     
-    # Check if projects directory exists
-    if not os.path.exists(projects_dir):
+    # Find all directories with a docker-compose.yml file; DirEntry.is_dir()
+    # comes from the directory read, so only the marker files are stat'ed
+    try:
+        entries = os.scandir(projects_dir)
+    except FileNotFoundError:
         print(f"Projects directory '{projects_dir}' not found.")
         return 0
     
-    # Find all directories with a docker-compose.yml file
-    for item in os.listdir(projects_dir):
-        item_path = os.path.join(projects_dir, item)
-        if os.path.isdir(item_path) and os.path.exists(os.path.join(item_path, 'docker-compose.yml')):
+    with entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
             # Check if it's likely a Supabase project
-            if os.path.exists(os.path.join(item_path, 'volumes')) and os.path.exists(os.path.join(item_path, '.env')):
-                projects.append(item_path)
+            try:
+                for marker in ('docker-compose.yml', 'volumes', '.env'):
+                    os.stat(os.path.join(entry.path, marker))
+            except OSError:
+                continue
+            projects.append(entry.path)
     
     if not projects:
         print("No Supabase projects found in the current directory.")
@@ -296,26 +392,21 @@ def list_projects(args):
     
     print("Supabase projects:")
     print("-" * 50)
-    for project in projects:
-        # Check if project is running
-        try:
-            result = subprocess.run(
-                ["docker", "compose", "ps", "--services", "--filter", "status=running"],
-                cwd=project,
-                capture_output=True,
-                text=True
-            )
-            is_running = result.returncode == 0 and result.stdout.strip() != ""
-            status = "Running" if is_running else "Stopped"
-        except Exception:
-            status = "Unknown"
-        
-        print(f"{project:<30} {status}")
+    # The docker CLI calls are I/O-bound, so query every project at once;
+    # map() yields results in the original order
+    with ThreadPoolExecutor(max_workers=min(8, len(projects))) as pool:
+        for project, status in zip(projects, pool.map(_project_run_status, projects)):
+            print(f"{project:<30} {status}")
     
     return 0
 
+@lru_cache(maxsize=None)
 def setup_parser():
-    """Set up the argument parser."""
+    """Set up the argument parser.
+
+    The parser is built once and reused, since parse_args() leaves it
+    unchanged; repeated main() calls skip rebuilding the subparsers.
+    """
     parser = argparse.ArgumentParser(description="Supabase Project Manager")
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
     
@@ -6,13 +6,167 @@ This script creates a new Supabase self-hosted deployment with custom port mappi
 """
 
 import os
-import shutil
+import base64
 import socket
-import argparse
-import subprocess
-import random
-import string
-from pathlib import Path
+import sys
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from pathlib import Path, PurePosixPath
+from string import Template
+
+# Service port slots: (name, offset from the base port, display label)
+_PORT_SLOTS = (
+    ("kong_http", 0, "Kong HTTP"),
+    ("kong_https", 443, "Kong HTTPS"),
+    ("postgres", 1000, "PostgreSQL"),
+    ("pooler", 1001, "Pooler"),
+    ("studio", 2000, "Studio"),
+    ("analytics", 3000, "Analytics"),
+)
+
+# Leaf directories of a generated project (parents are implied)
+_PROJECT_DIRS = (
+    "volumes/api",
+    "volumes/db/data",
+    "volumes/functions/main",
+    "volumes/logs",
+    "volumes/pooler",
+    "volumes/storage",
+    "volumes/analytics",
+)
+
+# Every directory to create, parents first, so each needs a single mkdir
+_PROJECT_DIR_TREE = sorted(
+    {str(path) for leaf in _PROJECT_DIRS for path in (PurePosixPath(leaf), *PurePosixPath(leaf).parents)} - {"."},
+    key=lambda path: (path.count("/"), path),
+)
+
+# Files written by run(): (path relative to the project, template property, mode)
+_TEMPLATE_FILES = (
+    ("docker-compose.yml", "docker_compose", 0o666),
+    (".env", "env", 0o666),
+    ("volumes/api/kong.yml", "kong", 0o666),
+    ("volumes/pooler/pooler.exs", "pooler", 0o666),
+    ("volumes/db/_supabase.sql", "supabase_sql", 0o666),
+    ("volumes/db/logs.sql", "logs_sql", 0o666),
+    ("volumes/db/jwt.sql", "jwt_sql", 0o666),
+    ("volumes/db/pooler.sql", "pooler_sql", 0o666),
+    ("volumes/db/realtime.sql", "realtime_sql", 0o666),
+    ("volumes/db/roles.sql", "roles_sql", 0o666),
+    ("volumes/db/webhooks.sql", "webhooks_sql", 0o666),
+    ("volumes/functions/main/index.ts", "function_main", 0o666),
+    ("reset.sh", "reset_script", 0o755),
+    ("README.md", "readme", 0o666),
+)
+
+# Large config templates live as files next to this script
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Small templates stay inline; the literals are built once at import and
+# only filled in per instance with str.format (reset.sh has no fields)
+_FUNCTION_HELLO_TMPL = """// Follow this setup guide to integrate the Deno language server with your editor:
+// https://deno.land/manual/getting_started/setup_your_environment
+// This enables autocomplete, go to definition, etc.
+
+import {{ serve }} from "https://deno.land/std@0.131.0/http/server.ts";
+
+console.log("Hello from Functions!");
+
+serve(async (req) => {{
+  const {{ name }} = await req.json();
+  const data = {{
+    message: `Hello ${{name || "World"}}!`,
+    timestamp: new Date().toISOString(),
+    projectName: "{project_name}",
+  }};
+
+  return new Response(
+    JSON.stringify(data),
+    {{ headers: {{ "Content-Type": "application/json" }} }},
+  );
+}});"""
+
+_RESET_SCRIPT = b"""#!/bin/sh
+# Reset script for Supabase project
+
+echo "Stopping all containers..."
+docker compose down -v --remove-orphans
+
+echo "Removing database data..."
+rm -rf ./volumes/db/data
+
+echo "Recreating database data directory..."
+mkdir -p ./volumes/db/data
+
+echo "Reset complete. You can now start the project with: docker compose up"""
+
+_README_TMPL = """# Supabase Project: {project_name}
+
+This is a self-hosted Supabase deployment with custom port configurations.
+
+## Port Configuration
+
+- Kong HTTP API: {kong_http}
+- Kong HTTPS API: {kong_https}
+- PostgreSQL: {postgres}
+- Pooler (Connection Pooler): {pooler}
+- Studio Dashboard: {studio}
+- Analytics: {analytics}
+"""
+
+
+def _fast_mkdir(path):
+    """Create a directory, treating an existing one as success.
+
+    Attempting mkdir first and handling EEXIST skips the stat calls that
+    exists()/is_dir() checks or makedirs would make on the common path.
+    """
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        if not os.path.isdir(path):
+            os.unlink(path)  # Remove file if it exists
+            os.mkdir(path)
+
+
+def _write_file(path, data, mode=0o666):
+    """Write str or bytes to path with raw os.write calls.
+
+    Skips the buffered file object that open()/write_text would allocate;
+    a rendered template is encoded to UTF-8 exactly once, here. As with
+    open(), mode is filtered through the umask.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _random_token(length):
+    """Return a cryptographically random URL-safe string of `length` chars."""
+    # One os.urandom call and one C-level encode; 3 bytes give 4 characters
+    return base64.urlsafe_b64encode(os.urandom((length * 3 + 3) // 4))[:length].decode("ascii")
+
+
+@lru_cache(maxsize=None)
+def _load_template(name):
+    """Read a template file once per process."""
+    return Template((TEMPLATES_DIR / name).read_text(encoding="utf-8"))
+
+
+def _render_template(name, **values):
+    """Render a file from TEMPLATES_DIR, filling its ${name} placeholders.
+
+    safe_substitute leaves Compose-style ${ENV_VAR} references untouched;
+    a literal $$ must be written as $$$$ in the template file.
+    """
+    return _load_template(name).safe_substitute(values)
 
 
 class SupabaseProjectGenerator:
@@ -47,63 +201,30 @@ class SupabaseProjectGenerator:
         
         # Create project directory
         self._create_project_directory()
-        
-        # Templates and content
-        self.templates = {}
-        self._initialize_templates()
 
     def run(self):
         """Create project subdirectories and write template files."""
-        # Define subdirectories to create
-        subdirs = [
-            "volumes/api",
-            "volumes/db/data",
-            "volumes/functions",
-            "volumes/logs",
-            "volumes/pooler",
-            "volumes/storage",
-            "volumes/analytics",
-            "volumes/db"
+        # Join plain strings; a Path / per file would build throwaway Paths
+        base = os.fspath(self.project_dir)
+
+        # Create subdirectories, parents before children
+        for subdir in _PROJECT_DIR_TREE:
+            _fast_mkdir(os.path.join(base, subdir))
+
+        # Render every template here first: the cached properties are not
+        # thread-safe, and kong/env must share one set of generated secrets
+        # reset.sh gets its exec bits at creation, so no chmod is needed
+        jobs = [
+            (os.path.join(base, relpath), getattr(self, attr), mode)
+            for relpath, attr, mode in _TEMPLATE_FILES
         ]
-
-        # Create subdirectories
-        for subdir in subdirs:
-            dir_path = self.project_dir / subdir
-            if dir_path.exists() and not dir_path.is_dir():
-                dir_path.unlink()  # Remove file if it exists
-            dir_path.mkdir(parents=True, exist_ok=True)
-
-        # Ensure volumes/functions/main is a directory and add a sample function if missing
-        main_dir = self.project_dir / "volumes/functions/main"
-        if main_dir.exists() and not main_dir.is_dir():
-            main_dir.unlink()  # Remove file if it exists
-        main_dir.mkdir(parents=True, exist_ok=True)
-        sample_function = main_dir / "index.ts"
-        if not sample_function.exists():
-            sample_function.write_text("""// Sample Supabase Edge Function
-import { serve } from "https://deno.land/std@0.131.0/http/server.ts";
-serve((_req) => new Response("Hello from Edge Functions!"));
-""")
-
-        # Write template files
-        (self.project_dir / "docker-compose.yml").write_text(self.templates["docker_compose"])
-        (self.project_dir / ".env").write_text(self.templates["env"])
-        (self.project_dir / "volumes/api/kong.yml").write_text(self.templates["kong"])
+        # Then overlap the independent open/write/close calls
+        with ThreadPoolExecutor(max_workers=4) as write_pool:
+            for _ in write_pool.map(lambda job: _write_file(*job), jobs):
+                pass
         # Create docker-compose.override.yml to fix Kong YAML parsing issues
         self._create_docker_compose_override()
         self._write_vector_config()  # Use the dynamic vector config method
-        (self.project_dir / "volumes/pooler/pooler.exs").write_text(self.templates["pooler"])
-        (self.project_dir / "volumes/db/_supabase.sql").write_text(self.templates["supabase_sql"])
-        (self.project_dir / "volumes/db/logs.sql").write_text(self.templates["logs_sql"])
-        (self.project_dir / "volumes/db/jwt.sql").write_text(self.templates["jwt_sql"])
-        (self.project_dir / "volumes/db/pooler.sql").write_text(self.templates["pooler_sql"])
-        (self.project_dir / "volumes/db/realtime.sql").write_text(self.templates["realtime_sql"])
-        (self.project_dir / "volumes/db/roles.sql").write_text(self.templates["roles_sql"])
-        (self.project_dir / "volumes/db/webhooks.sql").write_text(self.templates["webhooks_sql"])
-        # Write to index.ts file inside the main directory, not to the directory itself
-        (self.project_dir / "volumes/functions/main/index.ts").write_text(self.templates["function_main"])
-        (self.project_dir / "reset.sh").write_text(self.templates["reset_script"])
-        (self.project_dir / "README.md").write_text(self.templates["readme"])
         
     def _create_docker_compose_override(self):
         """Create docker-compose.override.yml to fix Kong YAML parsing issues."""
@@ -113,13 +234,12 @@ serve((_req) => new Response("Hello from Edge Functions!"));
       - ./volumes/api/kong.yml:/home/kong/kong.yml:ro,z
     entrypoint: /docker-entrypoint.sh kong docker-start
 """
-        override_path = self.project_dir / "docker-compose.override.yml"
-        override_path.write_text(override_content)
+        _write_file(os.path.join(self.project_dir, "docker-compose.override.yml"), override_content)
         print(f"Created docker-compose.override.yml to fix Kong YAML parsing issues")
 
     def _write_vector_config(self):
         """Write the vector.yml config with dynamic project/service names."""
-        vector_template = self.templates["vector"]
+        vector_template = self.vector
         project_name = self.project_name
         analytics_service = f"{project_name}-analytics"
         kong_service = f"{project_name}-kong"
@@ -133,648 +253,117 @@ serve((_req) => new Response("Hello from Edge Functions!"));
         )
         
         # Write to the project directory
-        vector_path = self.project_dir / "volumes/logs/vector.yml"
-        vector_path.write_text(vector_config)
+        _write_file(os.path.join(self.project_dir, "volumes/logs/vector.yml"), vector_config)
 
     def _create_project_directory(self):
         """Create the project directory if it doesn't exist."""
-        if self.project_dir.exists():
-            raise FileExistsError(f"Directory {self.project_dir} already exists.")
-        
-        self.project_dir.mkdir(parents=True)
+        # A single mkdir both creates and checks, with no window for a race
+        try:
+            self.project_dir.mkdir(parents=True)
+        except FileExistsError:
+            raise FileExistsError(f"Directory {self.project_dir} already exists.") from None
         print(f"Created directory: {self.project_dir}")
 
-    def _is_port_available(self, port):
-        """Check if a port is available."""
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            return s.connect_ex(('localhost', port)) != 0
+    def _probe_socket(self):
+        """Create a TCP socket for bind-based port probes."""
+        # No SO_REUSEADDR: on macOS/BSD it lets a wildcard bind succeed next
+        # to a 127.0.0.1 listener, and on Windows over almost any bound port.
+        # A port in TIME_WAIT just reads as busy and the sweep moves on
+        return socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+    def _is_port_available(self, port, probe=None):
+        """Check if a port is available by trying to bind it.
+
+        A failed client connect does not prove a port is bindable, and every
+        connect attempt burns an ephemeral source port. Binding on all
+        interfaces mirrors how Docker publishes the service ports.
+
+        A failed bind leaves the socket unbound, so a caller scanning several
+        ports can pass the same probe socket until one binds.
+        """
+        if probe is None:
+            with self._probe_socket() as s:
+                return self._is_port_available(port, s)
+        try:
+            probe.bind(('', port))
+        except OSError:
+            return False
+        return True
 
     def _find_available_port(self, start_port, step=1):
-        """Find an available port starting from start_port."""
-        port = start_port
-        while not self._is_port_available(port):
-            port += step
-        return port
+        """Find the lowest available port starting from start_port.
+
+        Each probe is a single local bind() that returns immediately, so the
+        sweep runs inline and stops at the first free port.
+        """
+        # One socket serves the whole sweep; each slot thread gets its own
+        with self._probe_socket() as probe:
+            port = start_port
+            while not self._is_port_available(port, probe):
+                port += step
+            return port
 
     def _calculate_ports(self):
         """Calculate all required ports for the Supabase services."""
         if self.base_port is None:
-            # Find a random available base port between 3000 and 9000
-            self.base_port = self._find_available_port(random.randint(3000, 9000))
-        
-        ports = {
-            "kong_http": self._find_available_port(self.base_port),
-            "kong_https": self._find_available_port(self.base_port + 443),
-            "postgres": self._find_available_port(self.base_port + 1000),
-            "pooler": self._find_available_port(self.base_port + 1001),
-            "studio": self._find_available_port(self.base_port + 2000),
-            "analytics": self._find_available_port(self.base_port + 3000)
-        }
+            # Random base between 3000 and 9000. Not port 0: the kernel would
+            # pick from the ephemeral range, where outgoing connections can
+            # take the saved ports before the next `docker compose up`
+            self.base_port = self._find_available_port(3000 + secrets.randbelow(6001))
+
+        # Scan all slots concurrently
+        names = [name for name, _, _ in _PORT_SLOTS]
+        starts = [self.base_port + offset for _, offset, _ in _PORT_SLOTS]
+        with ThreadPoolExecutor(max_workers=len(_PORT_SLOTS)) as slot_pool:
+            ports = dict(zip(names, slot_pool.map(self._find_available_port, starts)))
         
-        print(f"Using base port: {self.base_port}")
-        print(f"Kong HTTP port: {ports['kong_http']}")
-        print(f"Kong HTTPS port: {ports['kong_https']}")
-        print(f"PostgreSQL port: {ports['postgres']}")
-        print(f"Pooler port: {ports['pooler']}")
-        print(f"Studio port: {ports['studio']}")
-        print(f"Analytics port: {ports['analytics']}")
+        sys.stdout.write(f"Using base port: {self.base_port}\n" + "".join(
+            f"{label} port: {ports[name]}\n" for name, _, label in _PORT_SLOTS
+        ))
         
         return ports
 
-    def _initialize_templates(self):
-        """Initialize template content for various files."""
-        self._init_docker_compose_template()
-        self._init_env_template()
-        self._init_vector_template()
-        self._init_kong_template()
-        self._init_pooler_template()
-        self._init_db_templates()
-        self._init_function_templates()
-        self._init_misc_templates()
-
-    def _init_docker_compose_template(self):
-        """Initialize docker-compose.yml template."""
-        self.templates["docker_compose"] = f"""
-name: {self.project_name}
-
-services:
-  studio:
-    container_name: {self.project_name}-studio
-    image: supabase/studio:latest
-    restart: unless-stopped
-    healthcheck:
-      test: ["CMD-SHELL", "echo ok"]
-      interval: 10s
-      timeout: 5s
-      retries: 3
-      start_period: 30s
-    ports:
-      - "{self.ports['studio']}:3000"
-    environment:
-      STUDIO_PG_META_URL: http://{self.project_name}-meta:8080
-      POSTGRES_PASSWORD: ${{POSTGRES_PASSWORD}}
-      DEFAULT_ORGANIZATION_NAME: ${{STUDIO_DEFAULT_ORGANIZATION}}
-      DEFAULT_PROJECT_NAME: ${{STUDIO_DEFAULT_PROJECT}}
-      SUPABASE_URL: http://{self.project_name}-kong:8000
-      SUPABASE_PUBLIC_URL: ${{SUPABASE_PUBLIC_URL}}
-      SUPABASE_ANON_KEY: ${{ANON_KEY}}
-      SUPABASE_SERVICE_KEY: ${{SERVICE_ROLE_KEY}}
-      AUTH_JWT_SECRET: ${{JWT_SECRET}}
-      LOGFLARE_API_KEY: ${{LOGFLARE_API_KEY}}
-      LOGFLARE_URL: http://{self.project_name}-analytics:4000
-      NEXT_PUBLIC_ENABLE_LOGS: true
-      NEXT_ANALYTICS_BACKEND_PROVIDER: postgres
-    depends_on:
-      analytics:
-        condition: service_healthy
-
-  kong:
-    container_name: {self.project_name}-kong
-    image: kong:2.8.1
-    restart: unless-stopped
-    ports:
-      - "{self.ports['kong_http']}:8000/tcp"
-      - "{self.ports['kong_https']}:8443/tcp"
-    volumes:
-      - ./volumes/api/kong.yml:/home/kong/temp.yml:ro,z
-    depends_on:
-      analytics:
-        condition: service_healthy
-    environment:
-      KONG_DATABASE: "off"
-      KONG_DECLARATIVE_CONFIG: /home/kong/kong.yml
-      KONG_DNS_ORDER: LAST,A,CNAME
-      KONG_PLUGINS: request-transformer,cors,key-auth,acl,basic-auth
-      KONG_NGINX_PROXY_PROXY_BUFFER_SIZE: 160k
-      KONG_NGINX_PROXY_PROXY_BUFFERS: 64 160k
-      SUPABASE_ANON_KEY: ${{ANON_KEY}}
-      SUPABASE_SERVICE_KEY: ${{SERVICE_ROLE_KEY}}
-      DASHBOARD_USERNAME: ${{DASHBOARD_USERNAME}}
-      DASHBOARD_PASSWORD: ${{DASHBOARD_PASSWORD}}
-    entrypoint: bash -c 'eval "echo \\"$$(cat ~/temp.yml)\\"" > ~/kong.yml && /docker-entrypoint.sh kong docker-start'
-
-  auth:
-    container_name: {self.project_name}-auth
-    image: supabase/gotrue:v2.170.0
-    restart: unless-stopped
-    healthcheck:
-      test:
-        [
-          "CMD",
-          "wget",
-          "--no-verbose",
-          "--tries=1",
-          "--spider",
-          "http://localhost:9999/health"
-        ]
-      timeout: 5s
-      interval: 5s
-      retries: 3
-    depends_on:
-      db:
-        condition: service_healthy
-      analytics:
-        condition: service_healthy
-    environment:
-      GOTRUE_API_HOST: 0.0.0.0
-      GOTRUE_API_PORT: 9999
-      API_EXTERNAL_URL: ${{API_EXTERNAL_URL}}
-      GOTRUE_DB_DRIVER: postgres
-      # Use the internal port for PostgreSQL (5432) for container-to-container communication
-      GOTRUE_DB_DATABASE_URL: postgres://supabase_auth_admin:${{POSTGRES_PASSWORD}}@${{POSTGRES_HOST}}:5432/${{POSTGRES_DB}}
-      GOTRUE_SITE_URL: ${{SITE_URL}}
-      GOTRUE_URI_ALLOW_LIST: ${{ADDITIONAL_REDIRECT_URLS}}
-      GOTRUE_DISABLE_SIGNUP: ${{DISABLE_SIGNUP}}
-      GOTRUE_JWT_ADMIN_ROLES: service_role
-      GOTRUE_JWT_AUD: authenticated
-      GOTRUE_JWT_DEFAULT_GROUP_NAME: authenticated
-      GOTRUE_JWT_EXP: ${{JWT_EXPIRY}}
-      GOTRUE_JWT_SECRET: ${{JWT_SECRET}}
-      GOTRUE_EXTERNAL_EMAIL_ENABLED: ${{ENABLE_EMAIL_SIGNUP}}
-      GOTRUE_EXTERNAL_ANONYMOUS_USERS_ENABLED: ${{ENABLE_ANONYMOUS_USERS}}
-      GOTRUE_MAILER_AUTOCONFIRM: ${{ENABLE_EMAIL_AUTOCONFIRM}}
-      GOTRUE_SMTP_ADMIN_EMAIL: ${{SMTP_ADMIN_EMAIL}}
-      GOTRUE_SMTP_HOST: ${{SMTP_HOST}}
-      GOTRUE_SMTP_PORT: ${{SMTP_PORT}}
-      GOTRUE_SMTP_USER: ${{SMTP_USER}}
-      GOTRUE_SMTP_PASS: ${{SMTP_PASS}}
-      GOTRUE_SMTP_SENDER_NAME: ${{SMTP_SENDER_NAME}}
-      GOTRUE_MAILER_URLPATHS_INVITE: ${{MAILER_URLPATHS_INVITE}}
-      GOTRUE_MAILER_URLPATHS_CONFIRMATION: ${{MAILER_URLPATHS_CONFIRMATION}}
-      GOTRUE_MAILER_URLPATHS_RECOVERY: ${{MAILER_URLPATHS_RECOVERY}}
-      GOTRUE_MAILER_URLPATHS_EMAIL_CHANGE: ${{MAILER_URLPATHS_EMAIL_CHANGE}}
-      GOTRUE_EXTERNAL_PHONE_ENABLED: ${{ENABLE_PHONE_SIGNUP}}
-      GOTRUE_SMS_AUTOCONFIRM: ${{ENABLE_PHONE_AUTOCONFIRM}}
-
-  rest:
-    container_name: {self.project_name}-rest
-    image: postgrest/postgrest:v12.2.8
-    restart: unless-stopped
-    depends_on:
-      db:
-        condition: service_healthy
-      analytics:
-        condition: service_healthy
-    environment:
-      # Use the internal port for PostgreSQL (5432) for container-to-container communication
-      PGRST_DB_URI: postgres://authenticator:${{POSTGRES_PASSWORD}}@${{POSTGRES_HOST}}:5432/${{POSTGRES_DB}}
-      PGRST_DB_SCHEMAS: ${{PGRST_DB_SCHEMAS}}
-      PGRST_DB_ANON_ROLE: anon
-      PGRST_JWT_SECRET: ${{JWT_SECRET}}
-      PGRST_DB_USE_LEGACY_GUCS: "false"
-      PGRST_APP_SETTINGS_JWT_SECRET: ${{JWT_SECRET}}
-      PGRST_APP_SETTINGS_JWT_EXP: ${{JWT_EXPIRY}}
-    command:
-      [
-        "postgrest"
-      ]
-
-  realtime:
-    container_name: realtime-dev.{self.project_name}-realtime
-    image: supabase/realtime:v2.34.43
-    restart: unless-stopped
-    depends_on:
-      db:
-        condition: service_healthy
-      analytics:
-        condition: service_healthy
-    healthcheck:
-      test:
-        [
-          "CMD",
-          "curl",
-          "-sSfL",
-          "--head",
-          "-o",
-          "/dev/null",
-          "-H",
-          "Authorization: Bearer ${{ANON_KEY}}",
-          "http://localhost:4000/api/tenants/realtime-dev/health"
-        ]
-      timeout: 5s
-      interval: 5s
-      retries: 3
-    environment:
-      PORT: 4000
-      DB_HOST: ${{POSTGRES_HOST}}
-      # Use the internal port for PostgreSQL (5432) for container-to-container communication
-      DB_PORT: 5432
-      DB_USER: supabase_admin
-      DB_PASSWORD: ${{POSTGRES_PASSWORD}}
-      DB_NAME: ${{POSTGRES_DB}}
-      DB_AFTER_CONNECT_QUERY: 'SET search_path TO _realtime'
-      DB_ENC_KEY: supabaserealtime
-      API_JWT_SECRET: ${{JWT_SECRET}}
-      SECRET_KEY_BASE: ${{SECRET_KEY_BASE}}
-      ERL_AFLAGS: -proto_dist inet_tcp
-      DNS_NODES: "''"
-      RLIMIT_NOFILE: "10000"
-      APP_NAME: realtime
-      SEED_SELF_HOST: true
-      RUN_JANITOR: true
-
-  storage:
-    container_name: {self.project_name}-storage
-    image: supabase/storage-api:v1.19.3
-    restart: unless-stopped
-    volumes:
-      - ./volumes/storage:/var/lib/storage:z
-    healthcheck:
-      test:
-        [
-          "CMD",
-          "wget",
-          "--no-verbose",
-          "--tries=1",
-          "--spider",
-          "http://{self.project_name}-storage:5000/status"
-        ]
-      timeout: 5s
-      interval: 5s
-      retries: 3
-    depends_on:
-      db:
-        condition: service_healthy
-      rest:
-        condition: service_started
-      imgproxy:
-        condition: service_started
-    environment:
-      ANON_KEY: ${{ANON_KEY}}
-      SERVICE_KEY: ${{SERVICE_ROLE_KEY}}
-      POSTGREST_URL: http://{self.project_name}-rest:3000
-      PGRST_JWT_SECRET: ${{JWT_SECRET}}
-      # Use the internal port for PostgreSQL (5432) for container-to-container communication
-      DATABASE_URL: postgres://supabase_storage_admin:${{POSTGRES_PASSWORD}}@${{POSTGRES_HOST}}:5432/${{POSTGRES_DB}}
-      FILE_SIZE_LIMIT: 52428800
-      STORAGE_BACKEND: file
-      FILE_STORAGE_BACKEND_PATH: /var/lib/storage
-      TENANT_ID: stub
-      REGION: stub
-      GLOBAL_S3_BUCKET: stub
-      ENABLE_IMAGE_TRANSFORMATION: "true"
-      IMGPROXY_URL: http://{self.project_name}-imgproxy:5001
-
-  imgproxy:
-    container_name: {self.project_name}-imgproxy
-    image: darthsim/imgproxy:v3.8.0
-    restart: unless-stopped
-    volumes:
-      - ./volumes/storage:/var/lib/storage:z
-    healthcheck:
-      test:
-        [
-          "CMD",
-          "imgproxy",
-          "health"
-        ]
-      timeout: 5s
-      interval: 5s
-      retries: 3
-    environment:
-      IMGPROXY_BIND: ":5001"
-      IMGPROXY_LOCAL_FILESYSTEM_ROOT: /
-      IMGPROXY_USE_ETAG: "true"
-      IMGPROXY_ENABLE_WEBP_DETECTION: ${{IMGPROXY_ENABLE_WEBP_DETECTION}}
-
-  meta:
-    container_name: {self.project_name}-meta
-    image: supabase/postgres-meta:v0.87.1
-    restart: unless-stopped
-    depends_on:
-      db:
-        condition: service_healthy
-      analytics:
-        condition: service_healthy
-    environment:
-      PG_META_PORT: 8080
-      PG_META_DB_HOST: ${{POSTGRES_HOST}}
-      # Use the internal port for PostgreSQL (5432) for container-to-container communication
-      PG_META_DB_PORT: 5432
-      PG_META_DB_NAME: ${{POSTGRES_DB}}
-      PG_META_DB_USER: supabase_admin
-      PG_META_DB_PASSWORD: ${{POSTGRES_PASSWORD}}
-
-  functions:
-    container_name: {self.project_name}-edge-functions
-    image: supabase/edge-runtime:v1.67.4
-    restart: unless-stopped
-    volumes:
-      - ./volumes/functions:/home/deno/functions:Z
-    depends_on:
-      analytics:
-        condition: service_healthy
-    environment:
-      JWT_SECRET: ${{JWT_SECRET}}
-      SUPABASE_URL: http://{self.project_name}-kong:8000
-      SUPABASE_ANON_KEY: ${{ANON_KEY}}
-      SUPABASE_SERVICE_ROLE_KEY: ${{SERVICE_ROLE_KEY}}
-      # Use the internal port for PostgreSQL (5432) for container-to-container communication
-      SUPABASE_DB_URL: postgresql://postgres:${{POSTGRES_PASSWORD}}@${{POSTGRES_HOST}}:5432/${{POSTGRES_DB}}
-      VERIFY_JWT: "${{FUNCTIONS_VERIFY_JWT}}"
-    command:
-      [
-        "start",
-        "--main-service",
-        "/home/deno/functions/main"
-      ]
-
-  analytics:
-    container_name: {self.project_name}-analytics
-    image: supabase/logflare:1.12.0
-    restart: unless-stopped
-    ports:
-      - "{self.ports['analytics']}:4000"
-    healthcheck:
-      test:
-        [
-          "CMD",
-          "curl",
-          "http://localhost:4000/health"
-        ]
-      timeout: 5s
-      interval: 5s
-      retries: 10
-    depends_on:
-      db:
-        condition: service_healthy
-    environment:
-      LOGFLARE_NODE_HOST: 127.0.0.1
-      DB_USERNAME: supabase_admin
-      DB_DATABASE: _supabase
-      DB_HOSTNAME: ${{POSTGRES_HOST}}
-      # Use the internal port for Postgre
-      # SQL (5432) for container-to-container communication
-      DB_PORT: 5432
-      DB_PASSWORD: ${{POSTGRES_PASSWORD}}
-      DB_SCHEMA: _analytics
-      LOGFLARE_API_KEY: ${{LOGFLARE_API_KEY}}
-      LOGFLARE_SINGLE_TENANT: true
-      LOGFLARE_SUPABASE_MODE: true
-      LOGFLARE_MIN_CLUSTER_SIZE: 1
-      # Use the internal port for PostgreSQL (5432) for container-to-container communication
-      POSTGRES_BACKEND_URL: postgresql://supabase_admin:${{POSTGRES_PASSWORD}}@${{POSTGRES_HOST}}:5432/_supabase
-      POSTGRES_BACKEND_SCHEMA: _analytics
-      LOGFLARE_FEATURE_FLAG_OVERRIDE: multibackend=true
-
-  db:
-    container_name: {self.project_name}-db
-    image: supabase/postgres:15.8.1.060
-    restart: unless-stopped
-    volumes:
-      - ./volumes/db/realtime.sql:/docker-entrypoint-initdb.d/migrations/99-realtime.sql:Z
-      - ./volumes/db/webhooks.sql:/docker-entrypoint-initdb.d/init-scripts/98-webhooks.sql:Z
-      - ./volumes/db/roles.sql:/docker-entrypoint-initdb.d/init-scripts/99-roles.sql:Z
-      - ./volumes/db/jwt.sql:/docker-entrypoint-initdb.d/init-scripts/99-jwt.sql:Z
-      - ./volumes/db/data:/var/lib/postgresql/data:Z
-      - ./volumes/db/_supabase.sql:/docker-entrypoint-initdb.d/migrations/97-_supabase.sql:Z
-      - ./volumes/db/logs.sql:/docker-entrypoint-initdb.d/migrations/99-logs.sql:Z
-      - ./volumes/db/pooler.sql:/docker-entrypoint-initdb.d/migrations/99-pooler.sql:Z
-      - {self.project_name}_db-config:/etc/postgresql-custom
-    healthcheck:
-      test:
-        [
-        "CMD",
-        "pg_isready",
-        "-U",
-        "postgres",
-        "-d",
-        "_supabase",
-        "-h",
-        "localhost"
-        ]
-      interval: 5s
-      timeout: 5s
-      retries: 10
-    depends_on:
-      vector:
-        condition: service_healthy
-    ports:
-      - "{self.ports['postgres']}:5432"
-    environment:
-      POSTGRES_HOST: /var/run/postgresql
-      PGPORT: 5432
-      POSTGRES_PORT: 5432
-      PGPASSWORD: ${{POSTGRES_PASSWORD}}
-      POSTGRES_PASSWORD: ${{POSTGRES_PASSWORD}}
-      PGDATABASE: ${{POSTGRES_DB}}
-      POSTGRES_DB: ${{POSTGRES_DB}}
-      JWT_SECRET: ${{JWT_SECRET}}
-      JWT_EXP: ${{JWT_EXPIRY}}
-    command:
-      [
-        "postgres",
-        "-c",
-        "config_file=/etc/postgresql/postgresql.conf",
-        "-c",
-        "log_min_messages=fatal"
-      ]
-
-  vector:
-    container_name: {self.project_name}-vector
-    image: timberio/vector:0.28.1-alpine
-    restart: unless-stopped
-    volumes:
-      - ./volumes/logs/vector.yml:/etc/vector/vector.yml:ro,z
-      - /var/run/docker.sock:/var/run/docker.sock:ro,z
-    healthcheck:
-      test:
-        [
-          "CMD",
-          "wget",
-          "--no-verbose",
-          "--tries=1",
-          "--spider",
-          "http://{self.project_name}-vector:9001/health"
-        ]
-      timeout: 5s
-      interval: 5s
-      retries: 3
-    environment:
-      LOGFLARE_API_KEY: ${{LOGFLARE_API_KEY}}
-    command:
-      [
-        "--config",
-        "/etc/vector/vector.yml"
-      ]
-    security_opt:
-      - "label=disable"
-
-  pooler:
-    container_name: {self.project_name}-pooler
-    image: supabase/supavisor:2.4.14
-    restart: unless-stopped
-    ports:
-      - "{self.ports['pooler']}:6543"
-    volumes:
-      - ./volumes/pooler/pooler.exs:/etc/pooler/pooler.exs:ro,z
-    healthcheck:
-      test:
-        [
-          "CMD",
-          "curl",
-          "-sSfL",
-          "--head",
-          "-o",
-          "/dev/null",
-          "http://127.0.0.1:4000/api/health"
-        ]
-      interval: 10s
-      timeout: 5s
-      retries: 5
-    depends_on:
-      db:
-        condition: service_healthy
-      analytics:
-        condition: service_healthy
-    environment:
-      PORT: 4000
-      POSTGRES_PORT: 5432
-      POSTGRES_DB: ${{POSTGRES_DB}}
-      POSTGRES_PASSWORD: ${{POSTGRES_PASSWORD}}
-      # Use the internal port for PostgreSQL (5432) for container-to-container communication
-      DATABASE_URL: ecto://supabase_admin:${{POSTGRES_PASSWORD}}@{self.project_name}-db:5432/_supabase
-      CLUSTER_POSTGRES: true
-      SECRET_KEY_BASE: ${{SECRET_KEY_BASE}}
-      VAULT_ENC_KEY: ${{VAULT_ENC_KEY}}
-      API_JWT_SECRET: ${{JWT_SECRET}}
-      METRICS_JWT_SECRET: ${{JWT_SECRET}}
-      REGION: local
-      ERL_AFLAGS: -proto_dist inet_tcp
-      POOLER_TENANT_ID: ${{POOLER_TENANT_ID}}
-      POOLER_DEFAULT_POOL_SIZE: ${{POOLER_DEFAULT_POOL_SIZE}}
-      POOLER_MAX_CLIENT_CONN: ${{POOLER_MAX_CLIENT_CONN}}
-      POOLER_POOL_MODE: transaction
-    command:
-      [
-        "/bin/sh",
-        "-c",
-        "/app/bin/migrate && /app/bin/supavisor eval \\"$$(cat /etc/pooler/pooler.exs)\\" && /app/bin/server"
-      ]
-
-volumes:
-  {self.project_name}_db-config:
-
-networks:
-  default:
-    name: {self.project_name}-network
-"""
+    @cached_property
+    def docker_compose(self):
+        """Rendered docker-compose.yml template."""
+        return _render_template(
+            "docker-compose.yml.tmpl", project_name=self.project_name, **self.ports
+        )
 
-    def _init_env_template(self):
-        """Initialize .env template."""
+    @cached_property
+    def env(self):
+        """Rendered .env template."""
         # Generate a random password and JWT secret
-        password = ''.join(random.choices(string.ascii_letters + string.digits, k=32))
-        jwt_secret = ''.join(random.choices(string.ascii_letters + string.digits, k=48))
-        secret_key_base = ''.join(random.choices(string.ascii_letters + string.digits, k=64))
-        vault_enc_key = ''.join(random.choices(string.ascii_letters + string.digits, k=32))
-        logflare_key = ''.join(random.choices(string.ascii_letters + string.digits, k=32))
+        password = _random_token(32)
+        jwt_secret = _random_token(48)
+        secret_key_base = _random_token(64)
+        vault_enc_key = _random_token(32)
+        logflare_key = _random_token(32)
         
-        self.templates["env"] = f"""############
-# Secrets
-# YOU MUST CHANGE THESE BEFORE GOING INTO PRODUCTION
-############
-POSTGRES_PASSWORD={password}
-JWT_SECRET={jwt_secret}
-ANON_KEY=eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyAgCiAgICAicm9sZSI6ICJhbm9uIiwKICAgICJpc3MiOiAic3VwYWJhc2UtZGVtbyIsCiAgICAiaWF0IjogMTY0MTc2OTIwMCwKICAgICJleHAiOiAxNzk5NTM1NjAwCn0.dc_X5iR_VP_qT0zsiyj_I_OZ2T9FtRU2BBNWN8Bu4GE
-SERVICE_ROLE_KEY=eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyAgCiAgICAicm9sZSI6ICJzZXJ2aWNlX3JvbGUiLAogICAgImlzcyI6ICJzdXBhYmFzZS1kZW1vIiwKICAgICJpYXQiOiAxNjQxNzY5MjAwLAogICAgImV4cCI6IDE3OTk1MzU2MDAKfQ.DaYlNEoUrrEn2Ig7tqibS-PHK5vgusbcbo7X36XVt4Q
-DASHBOARD_USERNAME=supabase
-DASHBOARD_PASSWORD={self.project_name}
-SECRET_KEY_BASE={secret_key_base}
-VAULT_ENC_KEY={vault_enc_key}
-############
-# Database - You can change these to any PostgreSQL database that has logical replication enabled.
-############
-# This is where other containers connect to the DB container internally
-POSTGRES_HOST={self.project_name}-db
-POSTGRES_DB=postgres
-# This port is used for external connections from your host
-POSTGRES_PORT={self.ports['postgres']}
-# default user is postgres
-############
-# Supavisor -- Database pooler
-############
-POOLER_PROXY_PORT_TRANSACTION={self.ports['pooler']}
-POOLER_DEFAULT_POOL_SIZE=20
-POOLER_MAX_CLIENT_CONN=100
-POOLER_TENANT_ID=your-tenant-id
-############
-# API Proxy - Configuration for the Kong Reverse proxy.
-############
-KONG_HTTP_PORT={self.ports['kong_http']}
-KONG_HTTPS_PORT={self.ports['kong_https']}
-############
-# API - Configuration for PostgREST.
-############
-PGRST_DB_SCHEMAS=public,storage,graphql_public
-############
-# Auth - Configuration for the GoTrue authentication server.
-############
-## General
-SITE_URL=http://localhost:{self.ports['studio']}
-ADDITIONAL_REDIRECT_URLS=
-JWT_EXPIRY=3600
-DISABLE_SIGNUP=false
-API_EXTERNAL_URL=http://localhost:{self.ports['kong_http']}
-## Mailer Config
-MAILER_URLPATHS_CONFIRMATION="/auth/v1/verify"
-MAILER_URLPATHS_INVITE="/auth/v1/verify"
-MAILER_URLPATHS_RECOVERY="/auth/v1/verify"
-MAILER_URLPATHS_EMAIL_CHANGE="/auth/v1/verify"
-## Email auth
-ENABLE_EMAIL_SIGNUP=true
-ENABLE_EMAIL_AUTOCONFIRM=true
-SMTP_ADMIN_EMAIL=admin@example.com
-SMTP_HOST={self.project_name}-mail
-SMTP_PORT=2500
-SMTP_USER=fake_mail_user
-SMTP_PASS=fake_mail_password
-SMTP_SENDER_NAME=fake_sender
-ENABLE_ANONYMOUS_USERS=false
-## Phone auth
-ENABLE_PHONE_SIGNUP=true
-ENABLE_PHONE_AUTOCONFIRM=true
-############
-# Studio - Configuration for the Dashboard
-############
-STUDIO_DEFAULT_ORGANIZATION="{self.project_name}"
-STUDIO_DEFAULT_PROJECT="{self.project_name}"
-STUDIO_PORT={self.ports['studio']}
-# replace if you intend to use Studio outside of localhost
-SUPABASE_PUBLIC_URL=http://localhost:{self.ports['kong_http']}
-# Enable webp support
-IMGPROXY_ENABLE_WEBP_DETECTION=true
-# Add your OpenAI API key to enable SQL Editor Assistant
-OPENAI_API_KEY=
-############
-# Functions - Configuration for Functions
-############
-# NOTE: VERIFY_JWT applies to all functions. Per-function VERIFY_JWT is not supported yet.
-FUNCTIONS_VERIFY_JWT=false
-############
-# Logs - Configuration for Logflare
-# Please refer to https://supabase.com/docs/reference/self-hosting-analytics/introduction
-############
-LOGFLARE_LOGGER_BACKEND_API_KEY={logflare_key}
-# Change vector.toml sinks to reflect this change
-LOGFLARE_API_KEY={logflare_key}
-# Docker socket location - this value will differ depending on your OS
-DOCKER_SOCKET_LOCATION=/var/run/docker.sock
-# Google Cloud Project details
-GOOGLE_PROJECT_ID=GOOGLE_PROJECT_ID
-GOOGLE_PROJECT_NUMBER=GOOGLE_PROJECT_NUMBER"""
-
-    def _init_vector_template(self):
-        """Initialize vector.yml template."""
+        return _render_template(
+            "env.tmpl",
+            project_name=self.project_name,
+            password=password,
+            jwt_secret=jwt_secret,
+            secret_key_base=secret_key_base,
+            vault_enc_key=vault_enc_key,
+            logflare_key=logflare_key,
+            **self.ports
+        )
+
+    @cached_property
+    def vector(self):
+        """vector.yml template, with __PROJECT__-style placeholders."""
         try:
             # Try to read the template from the file
             # Use path relative to this script's location
             vector_path = Path(__file__).parent / "vector.yml"
             if vector_path.exists():
-                self.templates["vector"] = vector_path.read_text()
+                vector = vector_path.read_text()
                 print(f"Using vector.yml template from {vector_path}")
             else:
                 # Fallback to the default template if file doesn't exist
-                self.templates["vector"] = """# Default Vector configuration for Supabase
+                vector = """# Default Vector configuration for Supabase
 api:
   enabled: true
   address: 0.0.0.0:9001
@@ -845,7 +434,7 @@ sinks:
         except Exception as e:
             print(f"Error loading vector template: {e}")
             # Fallback to a minimal template
-            self.templates["vector"] = """# Default Vector configuration for Supabase
+            vector = """# Default Vector configuration for Supabase
 api:
   enabled: true
   address: 0.0.0.0:9001
@@ -891,9 +480,11 @@ sinks:
       headers:
         Content-Type: application/json"""
             print("Using minimal vector.yml template with analytics placeholder")
+        return vector
 
-    def _init_kong_template(self):
-        """Initialize Kong API Gateway configuration."""
+    @cached_property
+    def kong(self):
+        """Rendered Kong API Gateway configuration."""
         anon_key = self._extract_env_value("ANON_KEY")
         service_key = self._extract_env_value("SERVICE_ROLE_KEY")
         dashboard_username = self._extract_env_value("DASHBOARD_USERNAME")
@@ -901,424 +492,28 @@ sinks:
         # Use the dynamically set cors_origins_config here
         cors_origins_setting = self.cors_origins_config 
 
-        self.templates["kong"] = f"""_format_version: '2.1'
-_transform: true
-
-consumers:
-  - username: DASHBOARD
-  - username: anon
-    keyauth_credentials:
-      - key: {anon_key}
-  - username: service_role
-    keyauth_credentials:
-      - key: {service_key}
-
-acls:
-  - consumer: anon
-    group: anon
-  - consumer: service_role
-    group: admin
-
-basicauth_credentials:
-  - consumer: DASHBOARD
-    username: {dashboard_username}
-    password: {dashboard_password}
-
-services:
-  - name: auth-v1
-    url: http://{self.project_name}-auth:9999/verify
-    routes:
-      - name: auth-v1-route
-        paths:
-          - /auth/v1/verify
-    plugins:
-      - name: cors
-        config:
-          origins:
-            - {cors_origins_setting}
-          methods:
-            - GET
-            - POST
-            - PUT
-            - PATCH
-            - DELETE
-            - OPTIONS
-          headers:
-            - Accept
-            - Authorization
-            - Content-Type
-            - X-Requested-With
-            - apikey
-            - x-supabase-api-version
-            - x-client-info
-            - accept-profile
-            - content-profile
-            - prefer
-            - Range
-            - Origin
-            - Referer
-            - Access-Control-Request-Headers
-            - Access-Control-Request-Method
-          exposed_headers:
-            - Content-Length
-            - Content-Range
-            - accept-ranges
-            - Content-Type
-            - Content-Profile
-            - Range-Unit
-          credentials: true
-          max_age: 3600
-  - name: auth-v1-api
-    url: http://{self.project_name}-auth:9999
-    routes:
-      - name: auth-v1-api-route
-        paths:
-          - /auth/v1
-    plugins:
-      - name: cors
-        config:
-          origins:
-            - {cors_origins_setting}
-          methods:
-            - GET
-            - POST
-            - PUT
-            - PATCH
-            - DELETE
-            - OPTIONS
-          headers:
-            - Accept
-            - Authorization
-            - Content-Type
-            - X-Requested-With
-            - apikey
-            - x-supabase-api-version
-            - x-client-info
-            - accept-profile
-            - content-profile
-            - prefer
-            - Range
-            - Origin
-            - Referer
-            - Access-Control-Request-Headers
-            - Access-Control-Request-Method
-          exposed_headers:
-            - Content-Length
-            - Content-Range
-            - accept-ranges
-            - Content-Type
-            - Content-Profile
-            - Range-Unit
-          credentials: true
-          max_age: 3600
-  - name: auth-v1-admin
-    url: http://{self.project_name}-auth:9999/admin
-    routes:
-      - name: auth-v1-admin-route
-        paths:
-          - /auth/v1/admin
-    plugins:
-      - name: cors
-        config:
-          origins:
-            - {cors_origins_setting}
-          methods:
-            - GET
-            - POST
-            - PUT
-            - PATCH
-            - DELETE
-            - OPTIONS
-          headers:
-            - Accept
-            - Authorization
-            - Content-Type
-            - X-Requested-With
-            - apikey
-            - x-supabase-api-version
-            - x-client-info
-            - accept-profile
-            - content-profile
-            - prefer
-            - Range
-            - Origin
-            - Referer
-            - Access-Control-Request-Headers
-            - Access-Control-Request-Method
-          exposed_headers:
-            - Content-Length
-            - Content-Range
-            - accept-ranges
-            - Content-Type
-            - Content-Profile
-            - Range-Unit
-          credentials: true
-          max_age: 3600
-      - name: key-auth
-        config:
-          hide_credentials: true
-      - name: acl
-        config:
-          hide_groups_header: true
-          allow:
-            - admin
-  - name: rest
-    url: http://{self.project_name}-rest:3000
-    routes:
-      - name: rest-route
-        paths:
-          - /rest/v1
-    plugins:
-      - name: cors
-        config:
-          origins:
-            - {cors_origins_setting}
-          methods:
-            - GET
-            - POST
-            - PUT
-            - PATCH
-            - DELETE
-            - OPTIONS
-          headers:
-            - Accept
-            - Authorization
-            - Content-Type
-            - X-Requested-With
-            - apikey
-            - x-supabase-api-version
-            - x-client-info
-            - accept-profile
-            - content-profile
-            - prefer
-            - Range
-            - Origin
-            - Referer
-            - Access-Control-Request-Headers
-            - Access-Control-Request-Method
-          exposed_headers:
-            - Content-Length
-            - Content-Range
-            - accept-ranges
-            - Content-Type
-            - Content-Profile
-            - Range-Unit
-          credentials: true
-          max_age: 3600
-  - name: postgrest
-    url: http://{self.project_name}-rest:3000
-    routes:
-      - name: postgrest-route
-        paths:
-          - /
-        strip_path: false
-    plugins:
-      - name: cors
-        config:
-          origins:
-            - {cors_origins_setting}
-          methods:
-            - GET
-            - POST
-            - PUT
-            - PATCH
-            - DELETE
-            - OPTIONS
-          headers:
-            - Accept
-            - Authorization
-            - Content-Type
-            - X-Requested-With
-            - apikey
-            - x-supabase-api-version
-            - x-client-info
-            - accept-profile
-            - content-profile
-          exposed_headers:
-            - Content-Length
-            - Content-Range
-          credentials: true
-          max_age: 3600
-  - name: realtime
-    url: http://{self.project_name}-realtime:4000/socket/
-    routes:
-      - name: realtime-route
-        paths:
-          - /realtime/v1
-        strip_path: true
-    plugins:
-      - name: cors
-        config:
-          origins:
-            - {cors_origins_setting}
-          methods:
-            - GET
-            - POST
-            - PUT
-            - PATCH
-            - DELETE
-            - OPTIONS
-          headers:
-            - Accept
-            - Authorization
-            - Content-Type
-            - X-Requested-With
-            - apikey
-            - x-supabase-api-version
-            - x-client-info
-            - accept-profile
-            - content-profile
-          exposed_headers:
-            - Content-Length
-            - Content-Range
-          credentials: true
-          max_age: 3600
-          
-  - name: realtime-api
-    url: http://{self.project_name}-realtime:4000
-    routes:
-      - name: realtime-api-route
-        paths:
-          - /api/tenants/realtime-dev
-    plugins:
-      - name: cors
-        config:
-          origins:
-            - {cors_origins_setting}
-          methods:
-            - GET
-            - HEAD
-            - OPTIONS
-          headers:
-            - Accept
-            - Authorization
-            - Content-Type
-            - apikey
-          exposed_headers:
-            - Content-Length
-            - Content-Range
-          credentials: true
-          max_age: 3600
-  - name: storage
-    url: http://{self.project_name}-storage:5000
-    routes:
-      - name: storage-route
-        paths:
-          - /storage/v1
-    plugins:
-      - name: cors
-        config:
-          origins:
-            - {cors_origins_setting}
-          methods:
-            - GET
-            - POST
-            - PUT
-            - PATCH
-            - DELETE
-            - OPTIONS
-          headers:
-            - Accept
-            - Authorization
-            - Content-Type
-            - X-Requested-With
-            - apikey
-            - x-supabase-api-version
-            - x-client-info
-            - accept-profile
-            - content-profile
-          exposed_headers:
-            - Content-Length
-            - Content-Range
-          credentials: true
-          max_age: 3600
-  - name: meta
-    url: http://{self.project_name}-meta:8080
-    routes:
-      - name: meta-route
-        paths:
-          - /pg
-    plugins:
-      - name: cors
-        config:
-          origins:
-            - {cors_origins_setting}
-          methods:
-            - GET
-            - POST
-            - PUT
-            - PATCH
-            - DELETE
-            - OPTIONS
-          headers:
-            - Accept
-            - Authorization
-            - Content-Type
-            - X-Requested-With
-            - apikey
-            - x-supabase-api-version
-            - x-client-info
-            - accept-profile
-            - content-profile
-          exposed_headers:
-            - Content-Length
-            - Content-Range
-          credentials: true
-          max_age: 3600
-      - name: key-auth
-        config:
-          hide_credentials: true
-      - name: acl
-        config:
-          hide_groups_header: true
-          allow:
-            - admin
-  - name: functions
-    url: http://{self.project_name}-edge-functions:9000
-    routes:
-      - name: functions-route
-        paths:
-          - /functions/v1
-    plugins:
-      - name: cors
-        config:
-          origins:
-            - {cors_origins_setting}
-          methods:
-            - GET
-            - POST
-            - PUT
-            - PATCH
-            - DELETE
-            - OPTIONS
-          headers:
-            - Accept
-            - Authorization
-            - Content-Type
-            - X-Requested-With
-            - apikey
-            - x-supabase-api-version
-            - x-client-info
-            - accept-profile            
-            - content-profile
-          exposed_headers:
-            - Content-Length
-            - Content-Range
-          credentials: true
-          max_age: 3600
-"""
+        return _render_template(
+            "kong.yml.tmpl",
+            project_name=self.project_name,
+            anon_key=anon_key,
+            service_key=service_key,
+            dashboard_username=dashboard_username,
+            dashboard_password=dashboard_password,
+            cors_origins=cors_origins_setting
+        )
 
     def _extract_env_value(self, key):
         """Extract a value from the env template or return a placeholder."""
-        env = self.templates.get("env", "")
+        env = self.env
         for line in env.splitlines():
             if line.startswith(f"{key}="):
                 return line.split("=", 1)[1].strip()
         return f"missing_{key}"
 
-    def _init_pooler_template(self):
-        """Initialize pooler configuration."""
-        self.templates["pooler"] = """{:ok, _} = Application.ensure_all_started(:supavisor)
+    @cached_property
+    def pooler(self):
+        """Pooler configuration."""
+        return b"""{:ok, _} = Application.ensure_all_started(:supavisor)
 
 {:ok, version} =
   case Supavisor.Repo.query!("select version()") do
@@ -1350,38 +545,54 @@ if !Supavisor.Tenants.get_tenant_by_external_id(params["external_id"]) do
 end
 """
 
-    def _init_db_templates(self):
-        """Initialize database SQL templates."""
-        self.templates["supabase_sql"] = """\\set pguser `echo "$POSTGRES_USER"`
+    @cached_property
+    def supabase_sql(self):
+        """_supabase database init script."""
+        return b"""\\set pguser `echo "$POSTGRES_USER"`
 
 CREATE DATABASE _supabase WITH OWNER :pguser;"""
 
-        self.templates["logs_sql"] = """\\set pguser `echo "$POSTGRES_USER"`
+    @cached_property
+    def logs_sql(self):
+        """Analytics schema init script."""
+        return b"""\\set pguser `echo "$POSTGRES_USER"`
 
 \\c _supabase
 create schema if not exists _analytics;
 alter schema _analytics owner to :pguser;
 \\c postgres"""
 
-        self.templates["jwt_sql"] = """\\set jwt_secret `echo "$JWT_SECRET"`
+    @cached_property
+    def jwt_sql(self):
+        """JWT settings init script."""
+        return b"""\\set jwt_secret `echo "$JWT_SECRET"`
 \\set jwt_exp `echo "$JWT_EXP"`
 
 ALTER DATABASE postgres SET "app.settings.jwt_secret" TO :'jwt_secret';
 ALTER DATABASE postgres SET "app.settings.jwt_exp" TO :'jwt_exp';"""
 
-        self.templates["pooler_sql"] = """\\set pguser `echo "$POSTGRES_USER"`
+    @cached_property
+    def pooler_sql(self):
+        """Pooler schema init script."""
+        return b"""\\set pguser `echo "$POSTGRES_USER"`
 
 \\c _supabase
 create schema if not exists _supavisor;
 alter schema _supavisor owner to :pguser;
 \\c postgres"""
 
-        self.templates["realtime_sql"] = """\\set pguser `echo "$POSTGRES_USER"`
+    @cached_property
+    def realtime_sql(self):
+        """Realtime schema init script."""
+        return b"""\\set pguser `echo "$POSTGRES_USER"`
 
 create schema if not exists _realtime;
 alter schema _realtime owner to :pguser;"""
 
-        self.templates["roles_sql"] = """-- NOTE: change to your own passwords for production environments
+    @cached_property
+    def roles_sql(self):
+        """Service role passwords init script."""
+        return b"""-- NOTE: change to your own passwords for production environments
 \\set pgpass `echo "$POSTGRES_PASSWORD"`
 
 ALTER USER authenticator WITH PASSWORD :'pgpass';
@@ -1390,7 +601,10 @@ ALTER USER supabase_auth_admin WITH PASSWORD :'pgpass';
 ALTER USER supabase_functions_admin WITH PASSWORD :'pgpass';
 ALTER USER supabase_storage_admin WITH PASSWORD :'pgpass';"""
 
-        self.templates["webhooks_sql"] = """BEGIN;
+    @cached_property
+    def webhooks_sql(self):
+        """Database webhooks init script."""
+        return b"""BEGIN;
   -- Create pg_net extension
   CREATE EXTENSION IF NOT EXISTS pg_net SCHEMA extensions;
   -- Create supabase_functions schema
@@ -1599,9 +813,10 @@ ALTER USER supabase_storage_admin WITH PASSWORD :'pgpass';"""
   GRANT EXECUTE ON FUNCTION supabase_functions.http_request() TO postgres, anon, authenticated, service_role;
 COMMIT;"""
 
-    def _init_function_templates(self):
-        """Initialize Edge Function templates."""
-        self.templates["function_main"] = """// Follow this setup guide to integrate the Deno language server with your editor:
+    @cached_property
+    def function_main(self):
+        """Main Edge Function source."""
+        return b"""// Follow this setup guide to integrate the Deno language server with your editor:
 // https://deno.land/manual/getting_started/setup_your_environment
 // This enables autocomplete, go to definition, etc.
 
@@ -1621,54 +836,17 @@ serve(async (req) => {
   );
 });"""
 
-        self.templates["function_hello"] = f"""// Follow this setup guide to integrate the Deno language server with your editor:
-// https://deno.land/manual/getting_started/setup_your_environment
-// This enables autocomplete, go to definition, etc.
+    @cached_property
+    def function_hello(self):
+        """Hello-world Edge Function source."""
+        return _FUNCTION_HELLO_TMPL.format(project_name=self.project_name)
 
-import {{ serve }} from "https://deno.land/std@0.131.0/http/server.ts";
+    @cached_property
+    def reset_script(self):
+        """Project reset shell script."""
+        return _RESET_SCRIPT
 
-console.log("Hello from Functions!");
-
-serve(async (req) => {{
-  const {{ name }} = await req.json();
-  const data = {{
-    message: `Hello ${{name || "World"}}!`,
-    timestamp: new Date().toISOString(),
-    projectName: "{self.project_name}",
-  }};
-
-  return new Response(
-    JSON.stringify(data),
-    {{ headers: {{ "Content-Type": "application/json" }} }},
-  );
-}});"""
-
-    def _init_misc_templates(self):
-        """Initialize miscellaneous templates."""
-        self.templates["reset_script"] = """#!/bin/sh
-# Reset script for Supabase project
-
-echo "Stopping all containers..."
-docker compose down -v --remove-orphans
-
-echo "Removing database data..."
-rm -rf ./volumes/db/data
-
-echo "Recreating database data directory..."
-mkdir -p ./volumes/db/data
-
-echo "Reset complete. You can now start the project with: docker compose up"""
-
-        self.templates["readme"] = f"""# Supabase Project: {self.project_name}
-
-This is a self-hosted Supabase deployment with custom port configurations.
-
-## Port Configuration
-
-- Kong HTTP API: {self.ports['kong_http']}
-- Kong HTTPS API: {self.ports['kong_https']}
-- PostgreSQL: {self.ports['postgres']}
-- Pooler (Connection Pooler): {self.ports['pooler']}
-- Studio Dashboard: {self.ports['studio']}
-- Analytics: {self.ports['analytics']}
-"""
+    @cached_property
+    def readme(self):
+        """Project README."""
+        return _README_TMPL.format(project_name=self.project_name, **self.ports)